@@ -2,13 +2,22 @@
 """Back-port compiler for Python 3.9 relaxed decorator expressions."""
 
 import argparse
+import collections
+import contextlib
+import functools
+import hashlib
+import mmap
 import os
 import pathlib
 import re
 import sys
+import tempfile
+import threading
 import traceback
-from typing import Generator, List, Optional, Union
+from typing import Any, Dict, Generator, List, Optional, Tuple, Union
 
+import bpc_utils
+import parso
 import parso.python.tree
 import parso.tree
 import tbtrim
@@ -65,6 +74,8 @@ _default_indentation = None  # auto detect
 _default_pep8 = True
 #: Default value for the ``decorator-name`` option.
 _default_decorator = '_relaxedecor_decorator'
+#: Default value for the ``cache_dir`` option.
+_default_cache_dir = None  # disabled
 
 # option getter utility functions
 # option value precedence is: explicit value (CLI/API arguments) > environment variable > default value
@@ -267,6 +278,27 @@ def _get_decorator_option(explicit: Optional[str] = None) -> Optional[str]:
     return explicit or os.getenv('RELAXEDECOR_DECORATOR') or _default_decorator
 
 
+def _get_cache_dir_option(explicit: Optional[str] = None) -> Optional[str]:
+    """Get the value for the ``cache_dir`` option.
+
+    Args:
+        explicit (Optional[str]): the value explicitly specified by user,
+            :data:`None` if not specified
+
+    Returns:
+        Optional[str]: the value for the ``cache_dir`` option;
+        :data:`None` means conversion results will not be cached on disk
+
+    :Environment Variables:
+        :envvar:`RELAXEDECOR_CACHE_DIR` -- the value in environment variable
+
+    See Also:
+        :data:`_default_cache_dir`
+
+    """
+    return explicit or os.getenv('RELAXEDECOR_CACHE_DIR') or _default_cache_dir
+
+
 ###############################################################################
 # Traceback Trimming (tbtrim)
 
@@ -306,6 +338,62 @@ def %(decorator)s(expr):
 '''.splitlines()  # `str.splitlines` will remove trailing newline
 
 
+@functools.lru_cache(maxsize=64)
+def _render_template(linesep: Linesep, indentation: str, decorator: str) -> str:
+    r"""Render :data:`DECORATOR_TEMPLATE` with the given configurations.
+
+    Args:
+        linesep (Literal['\\n', '\\r\\n', '\\r']): line separator
+        indentation (str): indentation sequence
+        decorator (str): name of the runtime decorator
+
+    Returns:
+        str: rendered decorator function, without trailing line separator
+
+    """
+    return linesep.join(DECORATOR_TEMPLATE) % dict(
+        decorator=decorator,
+        indentation=indentation,
+    )
+
+
+#: FrozenSet[str]: Types of parso nodes whose subtrees may contain decorators.
+#:
+#: Decorators only appear in :token:`decorated` statements, which in turn can only
+#: be nested in the suites of compound statements; expressions and simple statements
+#: can never contain decorators.
+_DECORATOR_CONTAINERS = frozenset({
+    'file_input', 'suite', 'decorated', 'decorators',
+    'funcdef', 'classdef', 'async_funcdef', 'async_stmt',
+    'if_stmt', 'while_stmt', 'for_stmt', 'with_stmt', 'try_stmt',
+})
+
+#: Pattern matching the ``@`` token of a decorator, which can only follow indentation
+#: (or a BOM) at the beginning of a physical line, as decorators start a logical line.
+_DECORATOR_LINE_PATTERN = re.compile(r'(?:^|\r)\ufeff?[ \t\f]*@', re.MULTILINE)
+#: Same as :data:`_DECORATOR_LINE_PATTERN` for :obj:`bytes` source code.
+_DECORATOR_LINE_PATTERN_BYTES = re.compile(rb'(?:^|\r)(?:\xef\xbb\xbf)?[ \t\f]*@', re.MULTILINE)
+
+
+def _may_have_decorators(code: Union[str, bytes, mmap.mmap]) -> bool:
+    """Check if source code may contain decorators without parsing it.
+
+    Args:
+        code (Union[str, bytes, mmap.mmap]): the source code to check, or a memory-mapped source file
+
+    Returns:
+        bool: :data:`False` if ``code`` certainly contains no decorators
+
+    The check may give false positives, e.g. for lines in multi-line strings
+    starting with ``@``, but never false negatives. The plain ``@`` membership
+    test runs first as it is much cheaper than the regular expression.
+
+    """
+    if isinstance(code, str):
+        return '@' in code and _DECORATOR_LINE_PATTERN.search(code) is not None
+    return code.find(b'@') != -1 and _DECORATOR_LINE_PATTERN_BYTES.search(code) is not None
+
+
 class Context(BaseContext):
     """General conversion context.
 
@@ -371,6 +459,8 @@ class Context(BaseContext):
                  indent_level: int = 0, raw: bool = False):
         #: str: Decorator name.
         self._decorator = config.decorator  # type: str
+        #: str: Opening of the runtime decorator call, i.e. ``decorator(``.
+        self._decorator_call = self._decorator + '('  # type: str
 
         super().__init__(node, config, indent_level=indent_level, raw=raw)
 
@@ -419,7 +509,7 @@ class Context(BaseContext):
 
         # namedexpr_test
         expr = next(children)
-        self += '%s(%s)' % (self._decorator, expr.get_code().strip())
+        self += self._decorator_call + expr.get_code().strip() + ')'
 
         # <Newline: '\n'>
         self._process(next(children))
@@ -474,39 +564,37 @@ class Context(BaseContext):
         and *else* statements.
 
         """
-        children = iter(node.children)
+        children = node.children
 
         # <Keyword: if>
-        self._process(next(children))
+        self._process(children[0])
         # namedexpr_test
-        self._process(next(children))
+        self._process(children[1])
         # <Operator: :>
-        self._process(next(children))
+        self._process(children[2])
         # suite
-        self._process_suite_node(next(children))
+        self._process_suite_node(children[3])
 
-        while True:
-            try:
-                # <Keyword: elif | else>
-                key = next(children)
-            except StopIteration:
-                break
+        index = 4
+        while index < len(children):
+            # <Keyword: elif | else>
+            key = children[index]
             self._process(key)
 
-            if key.value == 'elif':
+            if key.value == 'elif':  # type: ignore[attr-defined]
                 # namedexpr_test
-                self._process(next(children))
+                self._process(children[index + 1])
                 # <Operator: :>
-                self._process(next(children))
+                self._process(children[index + 2])
                 # suite
-                self._process_suite_node(next(children))
-                continue
-            if key.value == 'else':
+                self._process_suite_node(children[index + 3])
+                index += 4
+            else:
                 # <Operator: :>
-                self._process(next(children))
+                self._process(children[index + 1])
                 # suite
-                self._process_suite_node(next(children))
-                continue
+                self._process_suite_node(children[index + 2])
+                index += 3
 
     def _process_while_stmt(self, node: parso.python.tree.WhileStmt) -> None:
         """Process while statement (:token:`while_stmt`).
@@ -518,28 +606,24 @@ class Context(BaseContext):
         *else* statements.
 
         """
-        children = iter(node.children)
+        children = node.children
 
         # <Keyword: while>
-        self._process(next(children))
+        self._process(children[0])
         # namedexpr_test
-        self._process(next(children))
+        self._process(children[1])
         # <Operator: :>
-        self._process(next(children))
+        self._process(children[2])
         # suite
-        self._process_suite_node(next(children))
-
-        try:
-            key = next(children)
-        except StopIteration:
-            return
+        self._process_suite_node(children[3])
 
-        # <Keyword: else>
-        self._process(key)
-        # <Operator: :>
-        self._process(next(children))
-        # suite
-        self._process_suite_node(next(children))
+        if len(children) > 4:
+            # <Keyword: else>
+            self._process(children[4])
+            # <Operator: :>
+            self._process(children[5])
+            # suite
+            self._process_suite_node(children[6])
 
     def _process_for_stmt(self, node: parso.python.tree.ForStmt) -> None:
         """Process for statement (:token:`for_stmt`).
@@ -551,32 +635,28 @@ class Context(BaseContext):
         *else* statements.
 
         """
-        children = iter(node.children)
+        children = node.children
 
         # <Keyword: for>
-        self._process(next(children))
+        self._process(children[0])
         # exprlist
-        self._process(next(children))
+        self._process(children[1])
         # <Keyword: in>
-        self._process(next(children))
+        self._process(children[2])
         # testlist
-        self._process(next(children))
+        self._process(children[3])
         # <Operator: :>
-        self._process(next(children))
+        self._process(children[4])
         # suite
-        self._process_suite_node(next(children))
-
-        try:
-            key = next(children)
-        except StopIteration:
-            return
+        self._process_suite_node(children[5])
 
-        # <Keyword: else>
-        self._process(key)
-        # <Operator: :>
-        self._process(next(children))
-        # suite
-        self._process_suite_node(next(children))
+        if len(children) > 6:
+            # <Keyword: else>
+            self._process(children[6])
+            # <Operator: :>
+            self._process(children[7])
+            # suite
+            self._process_suite_node(children[8])
 
     def _process_with_stmt(self, node: parso.python.tree.WithStmt) -> None:
         """Process with statement (:token:`with_stmt`).
@@ -587,22 +667,14 @@ class Context(BaseContext):
         This method processes the indented suite under the *with* statement.
 
         """
-        children = iter(node.children)
-
         # <Keyword: with>
-        self._process(next(children))
-
-        while True:
-            # with_item | <Operator: ,>
-            item = next(children)
-            self._process(item)
-
-            # <Operator: :>
-            if item.type == 'operator' and item.value == ':':
-                break
+        # with_item | <Operator: ,>
+        # <Operator: :>
+        for child in node.children[:-1]:
+            self._process(child)
 
         # suite
-        self._process_suite_node(next(children))
+        self._process_suite_node(node.children[-1])
 
     def _process_try_stmt(self, node: parso.python.tree.TryStmt) -> None:
         """Process try statement (:token:`try_stmt`).
@@ -614,20 +686,15 @@ class Context(BaseContext):
         *else*, and *finally* statements.
 
         """
-        children = iter(node.children)
-
-        while True:
-            try:
-                key = next(children)
-            except StopIteration:
-                break
+        children = node.children
 
+        for index in range(0, len(children), 3):
             # <Keyword: try | else | finally> | PythonNode(except_clause, [...]
-            self._process(key)
+            self._process(children[index])
             # <Operator: :>
-            self._process(next(children))
+            self._process(children[index + 1])
             # suite
-            self._process_suite_node(next(children))
+            self._process_suite_node(children[index + 2])
 
     def _concat(self) -> None:
         """Concatenate final string.
@@ -648,8 +715,10 @@ class Context(BaseContext):
 
         # strip suffix comments
         prefix, suffix = self.split_comments(self._suffix, self._linesep)
-        match = re.match(r'^(?P<linesep>(%s)*)' % self._linesep, suffix, flags=re.ASCII)
-        suffix_linesep = match.group('linesep') if match is not None else ''
+        offset = 0
+        while suffix.startswith(self._linesep, offset):
+            offset += len(self._linesep)
+        suffix_linesep = suffix[:offset]
 
         # first, the prefix code
         self._buffer += self._prefix + prefix + suffix_linesep
@@ -664,10 +733,7 @@ class Context(BaseContext):
                                                                   expected=blank, linesep=self._linesep)
 
         # then, the decorator function
-        self._buffer += self._linesep.join(DECORATOR_TEMPLATE) % dict(
-            decorator=self._decorator,
-            indentation=self._indentation,
-        ) + self._linesep
+        self._buffer += _render_template(self._linesep, self._indentation, self._decorator) + self._linesep
 
         # finally, the suffix code
         if self._pep8:
@@ -675,6 +741,72 @@ class Context(BaseContext):
                                                                   expected=2, linesep=self._linesep)
         self._buffer += suffix.lstrip(self._linesep)
 
+    @final
+    @staticmethod
+    def _is_relaxed_decorator(node: parso.python.tree.Decorator) -> bool:
+        """Check if a decorator node uses relaxed decorator expressions.
+
+        Args:
+            node (parso.python.tree.Decorator): decorator node
+
+        Returns:
+            bool: if ``node`` is *not* in the old-fashioned decorator grammar
+
+        The check operates on parso's tokenised leaves (by their ``type`` and
+        ``value``) directly, i.e. the source code of the decorator expression is
+        never rebuilt with :meth:`~parso.tree.NodeOrLeaf.get_code` nor re-lexed.
+
+        """
+        # NOTE: referred netromdk/vermin#51 for possible solution, i.e.,
+        # ast.Name, ast.Attribute and ast.Load are the only scenarios for
+        # an old-fashioned decorator
+        child = node.children[1]
+        if child.type == 'name':
+            return False
+
+        trailers = getattr(child, 'children', None)
+        if trailers is not None:
+            # <Name: ...> trailer ...
+            children = iter(trailers)
+            name = next(children)
+            if name.type != 'name':
+                return True
+
+            # <Operator: .> <Name: ...>
+            # <Operator: (> [arglist] <Operator: )> -> at most once without PEP 614
+            func_call = False  # is function call detected
+            for child in children:
+                if func_call:  # there is already a function call, no more things allowed after that without PEP 614
+                    return True
+
+                # NOTE: Python 3.9 grammar takes all child nodes as trailer instead of wrapping
+                # them up by their types like in 3.8
+                if child.type == 'trailer':
+                    # <Operator: .> <Name: ...>
+                    # <Operator: (> <Operator: )> -> at most once without PEP 614
+                    if len(child.children) == 2:
+                        first, second = child.children
+                        if (first.type == 'operator' and first.value == '.'
+                                and second.type == 'name'):  # <Operator: .> <Name: ...>
+                            continue
+                        if first.type == 'operator' and first.value == '(' \
+                                and second.type == 'operator' and second.value == ')' \
+                                and not func_call:  # function call without arguments
+                            func_call = True
+                            continue
+
+                    # <Operator: (> [arglist] <Operator: )> -> at most once without PEP 614
+                    if len(child.children) == 3:
+                        left, _, right = child.children
+                        if left.type == 'operator' and left.value == '(' \
+                                and right.type == 'operator' and right.value == ')' \
+                                and not func_call:  # function call with arguments
+                            func_call = True
+                            continue
+                return True  # if it's a subscript getter, or not a trailer node
+            return False  # if all checks of old decorator grammar passed
+        return True  # if it's a node without children but not a Name node
+
     @final
     @classmethod
     def has_expr(cls, node: parso.tree.NodeOrLeaf) -> bool:
@@ -686,64 +818,154 @@ class Context(BaseContext):
         Returns:
             bool: if ``node`` has relaxed decorator expressions
 
+        The AST is traversed iteratively with an explicit stack, so that
+        deeply nested code will not hit the recursion limit. Only nodes listed in
+        :data:`_DECORATOR_CONTAINERS` are descended into.
+
         """
-        if node.type == 'decorator':
-            # NOTE: referred netromdk/vermin#51 for possible solution, i.e.,
-            # ast.Name, ast.Attribute and ast.Load are the only scenarios for
-            # an old-fashioned decorator
-            child = node.children[1]  # type: ignore[attr-defined]
-            if child.type == 'name':
-                return False
-
-            if hasattr(child, 'children'):
-                # <Name: ...> trailer ...
-                children = iter(child.children)
-                name = next(children)
-                if name.type != 'name':
+        stack = [node]
+        while stack:
+            node = stack.pop()
+            if node.type == 'decorator':
+                if cls._is_relaxed_decorator(node):  # type: ignore[arg-type]
                     return True
-
-                # <Operator: .> <Name: ...>
-                # <Operator: (> [arglist] <Operator: )> -> at most once without PEP 614
-                func_call = False  # is function call detected
-                for child in children:
-                    if func_call:  # there is already a function call, no more things allowed after that without PEP 614
-                        return True
-
-                    # NOTE: Python 3.9 grammar takes all child nodes as trailer instead of wrapping
-                    # them up by their types like in 3.8
-                    if child.type == 'trailer':
-                        # <Operator: .> <Name: ...>
-                        # <Operator: (> <Operator: )> -> at most once without PEP 614
-                        if len(child.children) == 2:
-                            first, second = child.children
-                            if (first.type == 'operator' and first.value == '.'
-                                    and second.type == 'name'):  # <Operator: .> <Name: ...>
-                                continue
-                            if first.type == 'operator' and first.value == '(' \
-                                    and second.type == 'operator' and second.value == ')' \
-                                    and not func_call:  # function call without arguments
-                                func_call = True
-                                continue
-
-                        # <Operator: (> [arglist] <Operator: )> -> at most once without PEP 614
-                        if len(child.children) == 3:
-                            left, _, right = child.children
-                            if left.type == 'operator' and left.value == '(' \
-                                    and right.type == 'operator' and right.value == ')' \
-                                    and not func_call:  # function call with arguments
-                                func_call = True
-                                continue
-                    return True  # if it's a subscript getter, or not a trailer node
-                return False  # if all checks of old decorator grammar passed
-            return True  # if it's a node without children but not a Name node
-        if hasattr(node, 'children'):
-            return any(map(cls.has_expr, node.children))  # type: ignore[attr-defined]
+                continue
+            if node.type in _DECORATOR_CONTAINERS:
+                stack.extend(node.children)  # type: ignore[attr-defined]
         return False
 
     # backward compatibility and auxiliary alias
     has_relaxedecor = has_expr
 
 
+###############################################################################
+# Conversion Cache
+
+#: int: Maximum number of conversion results kept in :data:`_memory_cache`.
+_MEMORY_CACHE_SIZE = 128
+#: OrderedDict[str, str]: In-process LRU cache of conversion results, keyed by :func:`_get_cache_key`.
+_memory_cache = collections.OrderedDict()  # type: collections.OrderedDict[str, str]
+#: threading.Lock: Lock guarding updates to :data:`_memory_cache`.
+_memory_cache_lock = threading.Lock()
+
+
+def _get_cache_key(code: Union[str, bytes], *, source_version: Optional[str], linesep: Optional[Linesep],
+                   indentation: Optional[str], pep8: Optional[bool], decorator: Optional[str]) -> str:
+    """Compute the cache key of a conversion.
+
+    Args:
+        code (Union[str, bytes]): the source code to be converted
+
+    Keyword Args:
+        source_version (Optional[str]): parse the code as this Python version
+        linesep (Optional[str]): line separator of code, :data:`None` for auto detection
+        indentation (Optional[str]): code indentation style, :data:`None` for auto detection
+        pep8 (Optional[bool]): whether to make code insertion :pep:`8` compliant
+        decorator (Optional[str]): name of the runtime decorator
+
+    Returns:
+        str: SHA-256 hex digest of the source code and the conversion options
+
+    Note:
+        The ``linesep`` and ``indentation`` options are keyed *before* auto detection,
+        since detected values are determined by the source code itself.
+
+        :obj:`str` and :obj:`bytes` inputs are tagged differently, since the same
+        byte sequence decodes to different text depending on the declared encoding.
+
+    """
+    if isinstance(code, str):
+        data = b's' + code.encode('utf-8', 'surrogatepass')
+    else:
+        data = b'b' + code
+    options = repr((source_version, linesep, indentation, pep8, decorator))
+    return hashlib.sha256(_get_cache_salt() + data + b'\0' + options.encode('utf-8')).hexdigest()
+
+
+@functools.lru_cache(maxsize=None)
+def _get_cache_salt() -> bytes:
+    """Get the salt of cache keys.
+
+    Returns:
+        bytes: SHA-256 digest of the versions of relaxedecor, parso and bpc-utils,
+        as well as the source code of this module
+
+    The module source is included so that cached results are invalidated
+    whenever the conversion logic changes, even if ``__version__`` does not.
+
+    """
+    salt = hashlib.sha256(repr((__version__, parso.__version__, bpc_utils.__version__)).encode('utf-8'))
+    with contextlib.suppress(OSError):
+        with open(__file__, 'rb') as file:
+            salt.update(file.read())
+    return salt.digest()
+
+
+def _save_memory_cache(key: str, result: str) -> None:
+    """Save conversion result to the in-process cache.
+
+    Args:
+        key (str): cache key as returned by :func:`_get_cache_key`
+        result (str): the conversion result
+
+    The entry is marked as most recently used, and the least recently used
+    entries are evicted once :data:`_MEMORY_CACHE_SIZE` is exceeded. The update
+    is done under :data:`_memory_cache_lock`, as :func:`convert` may be called
+    from multiple threads.
+
+    """
+    with _memory_cache_lock:
+        _memory_cache[key] = result
+        _memory_cache.move_to_end(key)
+        while len(_memory_cache) > _MEMORY_CACHE_SIZE:
+            _memory_cache.popitem(last=False)
+
+
+def _load_cache(cache_dir: str, key: str) -> Optional[str]:
+    """Load cached conversion result.
+
+    Args:
+        cache_dir (str): path to the cache directory
+        key (str): cache key as returned by :func:`_get_cache_key`
+
+    Returns:
+        Optional[str]: the cached conversion result, :data:`None` if not found
+
+    """
+    try:
+        with open(os.path.join(cache_dir, key), 'rb') as file:
+            return file.read().decode('utf-8', 'surrogatepass')
+    except (OSError, UnicodeDecodeError):
+        return None
+
+
+def _save_cache(cache_dir: str, key: str, result: str) -> None:
+    """Save conversion result to cache.
+
+    Args:
+        cache_dir (str): path to the cache directory
+        key (str): cache key as returned by :func:`_get_cache_key`
+        result (str): the conversion result
+
+    The cache file is first written to a temporary file then renamed, so that
+    concurrent workers will never read a partially written cache file. Failures
+    are silently ignored, as the cache is merely an optimisation.
+
+    """
+    with contextlib.suppress(OSError):
+        os.makedirs(cache_dir, exist_ok=True)
+        file = tempfile.NamedTemporaryFile('wb', dir=cache_dir, prefix='.relaxedecor-', delete=False)
+        try:
+            with file:
+                file.write(result.encode('utf-8', 'surrogatepass'))
+            os.replace(file.name, os.path.join(cache_dir, key))
+        except BaseException:
+            # never leave the temporary file behind, whatever went wrong
+            with contextlib.suppress(OSError):
+                os.remove(file.name)
+            raise
+
+
 ###############################################################################
 # Public Interface
 
@@ -753,7 +975,7 @@ exec(os.linesep.join(DECORATOR_TEMPLATE) % dict(decorator='decorator', indentati
 def convert(code: Union[str, bytes], filename: Optional[str] = None, *,
             source_version: Optional[str] = None, linesep: Optional[Linesep] = None,
             indentation: Optional[Union[int, str]] = None, pep8: Optional[bool] = None,
-            decorator: Optional[str] = None) -> str:
+            decorator: Optional[str] = None, cache_dir: Optional[str] = None) -> str:
     """Convert the given Python source code string.
 
     Args:
@@ -766,6 +988,7 @@ def convert(code: Union[str, bytes], filename: Optional[str] = None, *,
         indentation (Optional[Union[int, str]]): code indentation style, specify an integer for the number of spaces,
             or ``'t'``/``'tab'`` for tabs (auto detect by default)
         pep8 (Optional[bool]): whether to make code insertion :pep:`8` compliant
+        cache_dir (Optional[str]): path to the directory for caching conversion results (disabled by default)
 
     :Environment Variables:
      - :envvar:`RELAXEDECOR_SOURCE_VERSION` -- same as the ``source_version`` argument and the ``--source-version`` option
@@ -774,6 +997,7 @@ def convert(code: Union[str, bytes], filename: Optional[str] = None, *,
      - :envvar:`RELAXEDECOR_INDENTATION` -- same as the ``indentation`` argument and the ``--indentation`` option in CLI
      - :envvar:`RELAXEDECOR_PEP8` -- same as the ``pep8`` argument and the ``--no-pep8`` option in CLI (logical negation)
      - :envvar:`RELAXEDECOR_DECORATOR` -- same as the ``--decorator-name`` option in CLI
+     - :envvar:`RELAXEDECOR_CACHE_DIR` -- same as the ``cache_dir`` argument and the ``--cache-dir`` option in CLI
 
     Returns:
         str: converted source code
@@ -782,19 +1006,13 @@ def convert(code: Union[str, bytes], filename: Optional[str] = None, *,
         ValueError: if ``decorator`` is not a valid identifier name or starts with double underscore
 
     """
-    # parse source string
+    # get conversion options
     source_version = _get_source_version_option(source_version)
-    module = parso_parse(code, filename=filename, version=source_version)
-
-    # get linesep, indentation and pep8 options
     linesep = _get_linesep_option(linesep)
     indentation = _get_indentation_option(indentation)
-    if linesep is None:
-        linesep = detect_linesep(code)
-    if indentation is None:
-        indentation = detect_indentation(code)
     pep8 = _get_pep8_option(pep8)
     decorator = _get_decorator_option(decorator)
+    cache_dir = _get_cache_dir_option(cache_dir)
 
     # validate that decorator name is valid identifier
     if not decorator.isidentifier():
@@ -804,6 +1022,35 @@ def convert(code: Union[str, bytes], filename: Optional[str] = None, *,
     if decorator.startswith('__'):
         raise ValueError('name of decorator for runtime checks should not start with double underscore')
 
+    # code without any decorators can be returned as is
+    if not _may_have_decorators(code):
+        if isinstance(code, bytes):
+            try:
+                return code.decode(detect_encoding(code))
+            except SyntaxError as error:
+                raise BPCSyntaxError('failed to detect encoding for source file %r: %s'
+                                     % (first_non_none(filename, '<unknown>'), error)) from None
+        return code
+
+    # look up cached conversion result, first in memory then on disk
+    cache_key = _get_cache_key(code, source_version=source_version, linesep=linesep,
+                               indentation=indentation, pep8=pep8, decorator=decorator)
+    cached = _memory_cache.get(cache_key)
+    if cached is None and cache_dir is not None:
+        cached = _load_cache(cache_dir, cache_key)
+    if cached is not None:
+        _save_memory_cache(cache_key, cached)
+        return cached
+
+    # parse source string
+    module = parso_parse(code, filename=filename, version=source_version)
+
+    # auto detect linesep and indentation
+    if linesep is None:
+        linesep = detect_linesep(code)
+    if indentation is None:
+        indentation = detect_indentation(code)
+
     # pack conversion configuration
     config = Config(linesep=linesep, indentation=indentation, pep8=pep8,
                     filename=filename, source_version=source_version,
@@ -812,15 +1059,20 @@ def convert(code: Union[str, bytes], filename: Optional[str] = None, *,
     # convert source string
     result = Context(module, config).string  # type: ignore[arg-type]
 
+    # save conversion result to cache
+    _save_memory_cache(cache_key, result)
+    if cache_dir is not None:
+        _save_cache(cache_dir, cache_key, result)
+
     # return conversion result
     return result
 
 
 def relaxedecor(filename: str, *, source_version: Optional[str] = None, linesep: Optional[Linesep] = None,
                 indentation: Optional[Union[int, str]] = None, pep8: Optional[bool] = None,
-                decorator: Optional[str] = None,
+                decorator: Optional[str] = None, cache_dir: Optional[str] = None,
                 quiet: Optional[bool] = None, dry_run: bool = False) -> None:
-    """Convert the given Python source code file. The file will be overwritten.
+    """Convert the given Python source code file. The file will be overwritten if changed.
 
     Args:
         filename (str): the file to convert
@@ -831,6 +1083,7 @@ def relaxedecor(filename: str, *, source_version: Optional[str] = None, linesep:
         indentation (Optional[Union[int, str]]): code indentation style, specify an integer for the number of spaces,
             or ``'t'``/``'tab'`` for tabs (auto detect by default)
         pep8 (Optional[bool]): whether to make code insertion :pep:`8` compliant
+        cache_dir (Optional[str]): path to the directory for caching conversion results (disabled by default)
         quiet (Optional[bool]): whether to run in quiet mode
         dry_run (bool): if :data:`True`, only print the name of the file to convert but do not perform any conversion
 
@@ -842,6 +1095,7 @@ def relaxedecor(filename: str, *, source_version: Optional[str] = None, linesep:
      - :envvar:`RELAXEDECOR_PEP8` -- same as the ``pep8`` argument and the ``--no-pep8`` option in CLI (logical negation)
      - :envvar:`RELAXEDECOR_QUIET` -- same as the ``quiet`` argument and the ``--quiet`` option in CLI
      - :envvar:`RELAXEDECOR_DECORATOR` -- same as the ``--decorator-name`` option in CLI
+     - :envvar:`RELAXEDECOR_CACHE_DIR` -- same as the ``cache_dir`` argument and the ``--cache-dir`` option in CLI
 
     """
     quiet = _get_quiet_option(quiet)
@@ -855,23 +1109,19 @@ def relaxedecor(filename: str, *, source_version: Optional[str] = None, linesep:
     with open(filename, 'rb') as file:
         content = file.read()
 
-    # detect source code encoding
+    # detect source code encoding and decode only once,
+    # linesep and indentation will be detected on the decoded text by :func:`convert`
     encoding = detect_encoding(content)
-
-    # get linesep and indentation
-    linesep = _get_linesep_option(linesep)
-    indentation = _get_indentation_option(indentation)
-    if linesep is None or indentation is None:
-        with open(filename, 'r', encoding=encoding) as file:
-            if linesep is None:
-                linesep = detect_linesep(file)
-            if indentation is None:
-                indentation = detect_indentation(file)
+    code = content.decode(encoding)
 
     # do the dirty things
-    result = convert(content, filename=filename, source_version=source_version,
+    result = convert(code, filename=filename, source_version=source_version,
                      linesep=linesep, indentation=indentation, pep8=pep8,
-                     decorator=decorator)
+                     decorator=decorator, cache_dir=cache_dir)
+
+    # nothing to do if the file does not contain relaxed decorators
+    if result == code:
+        return
 
     # overwrite the file with conversion result
     with open(filename, 'w', encoding=encoding, newline='') as file:
@@ -881,32 +1131,6 @@ def relaxedecor(filename: str, *, source_version: Optional[str] = None, linesep:
 ###############################################################################
 # CLI & Entry Point
 
-# option values display
-# these values are only intended for argparse help messages
-# this shows default values by default, environment variables may override them
-__cwd__ = os.getcwd()
-__relaxedecor_quiet__ = 'quiet mode' if _get_quiet_option() else 'non-quiet mode'
-__relaxedecor_concurrency__ = _get_concurrency_option() or 'auto detect'
-__relaxedecor_do_archive__ = 'will do archive' if _get_do_archive_option() else 'will not do archive'
-__relaxedecor_archive_path__ = os.path.join(__cwd__, _get_archive_path_option())
-__relaxedecor_source_version__ = _get_source_version_option()
-__relaxedecor_linesep__ = {
-    '\n': 'LF',
-    '\r\n': 'CRLF',
-    '\r': 'CR',
-    None: 'auto detect'
-}[_get_linesep_option()]
-__relaxedecor_indentation__ = _get_indentation_option()
-if __relaxedecor_indentation__ is None:
-    __relaxedecor_indentation__ = 'auto detect'
-elif __relaxedecor_indentation__ == '\t':
-    __relaxedecor_indentation__ = 'tab'
-else:
-    __relaxedecor_indentation__ = '%d spaces' % len(__relaxedecor_indentation__)
-__relaxedecor_pep8__ = 'will conform to PEP 8' if _get_pep8_option() else 'will not conform to PEP 8'
-__relaxedecor_decorator__ = _get_decorator_option() or '_relaxedecor_decorator'
-
-
 def get_parser() -> argparse.ArgumentParser:
     """Generate CLI parser.
 
@@ -914,14 +1138,41 @@ def get_parser() -> argparse.ArgumentParser:
         argparse.ArgumentParser: CLI parser for relaxedecor
 
     """
+    # option values display
+    # these values are only intended for argparse help messages
+    # this shows default values by default, environment variables may override them
+    # they are evaluated lazily here, so that importing the module as a library does not pay for them
+    cwd = os.getcwd()
+    relaxedecor_quiet = 'quiet mode' if _get_quiet_option() else 'non-quiet mode'
+    relaxedecor_concurrency = _get_concurrency_option() or 'auto detect'
+    relaxedecor_do_archive = 'will do archive' if _get_do_archive_option() else 'will not do archive'
+    relaxedecor_archive_path = os.path.join(cwd, _get_archive_path_option())
+    relaxedecor_source_version = _get_source_version_option()
+    relaxedecor_linesep = {
+        '\n': 'LF',
+        '\r\n': 'CRLF',
+        '\r': 'CR',
+        None: 'auto detect'
+    }[_get_linesep_option()]
+    relaxedecor_indentation = _get_indentation_option()
+    if relaxedecor_indentation is None:
+        relaxedecor_indentation = 'auto detect'
+    elif relaxedecor_indentation == '\t':
+        relaxedecor_indentation = 'tab'
+    else:
+        relaxedecor_indentation = '%d spaces' % len(relaxedecor_indentation)
+    relaxedecor_pep8 = 'will conform to PEP 8' if _get_pep8_option() else 'will not conform to PEP 8'
+    relaxedecor_decorator = _get_decorator_option() or '_relaxedecor_decorator'
+    relaxedecor_cache_dir = _get_cache_dir_option() or 'disabled'
+
     parser = argparse.ArgumentParser(prog='relaxedecor',
                                      usage='relaxedecor [options] <Python source files and directories...>',
                                      description='Back-port compiler for Python 3.8 position-only parameters.')
     parser.add_argument('-V', '--version', action='version', version=__version__)
     parser.add_argument('-q', '--quiet', action='store_true', default=None,
-                        help='run in quiet mode (current: %s)' % __relaxedecor_quiet__)
+                        help='run in quiet mode (current: %s)' % relaxedecor_quiet)
     parser.add_argument('-C', '--concurrency', action='store', type=int, metavar='N',
-                        help='the number of concurrent processes for conversion (current: %s)' % __relaxedecor_concurrency__)
+                        help='the number of concurrent processes for conversion (current: %s)' % relaxedecor_concurrency)
     parser.add_argument('--dry-run', action='store_true',
                         help='list the files to be converted without actually performing conversion and archiving')
     parser.add_argument('-s', '--simple', action='store', nargs='?', dest='simple_args', const='', metavar='FILE',
@@ -935,9 +1186,9 @@ def get_parser() -> argparse.ArgumentParser:
     archive_group = parser.add_argument_group(title='archive options',
                                               description="backup original files in case there're any issues")
     archive_group.add_argument('-na', '--no-archive', action='store_false', dest='do_archive', default=None,
-                               help='do not archive original files (current: %s)' % __relaxedecor_do_archive__)
-    archive_group.add_argument('-k', '--archive-path', action='store', default=__relaxedecor_archive_path__, metavar='PATH',  # pylint: disable=line-too-long
-                               help='path to archive original files (current: %(default)s)')
+                               help='do not archive original files (current: %s)' % relaxedecor_do_archive)
+    archive_group.add_argument('-k', '--archive-path', action='store', metavar='PATH',
+                               help='path to archive original files (current: %s)' % relaxedecor_archive_path)
     archive_group.add_argument('-r', '--recover', action='store', dest='recover_file', metavar='ARCHIVE_FILE',
                                help='recover files from a given archive file')
     archive_group.add_argument('-r2', action='store_true', help='remove the archive file after recovery')
@@ -947,18 +1198,21 @@ def get_parser() -> argparse.ArgumentParser:
     # TODO: revise ``--dismiss-runtime`` & ``--decorator-name`` options
     convert_group = parser.add_argument_group(title='convert options', description='conversion configuration')
     convert_group.add_argument('-vs', '-vf', '--source-version', '--from-version', action='store', metavar='VERSION',
-                               default=__relaxedecor_source_version__, choices=RELAXEDECOR_SOURCE_VERSIONS,
-                               help='parse source code as this Python version (current: %(default)s)')
+                               choices=RELAXEDECOR_SOURCE_VERSIONS,
+                               help='parse source code as this Python version '
+                                    '(current: %s)' % relaxedecor_source_version)
     convert_group.add_argument('-l', '--linesep', action='store',
                                help='line separator (LF, CRLF, CR) to read '
-                                    'source files (current: %s)' % __relaxedecor_linesep__)
+                                    'source files (current: %s)' % relaxedecor_linesep)
     convert_group.add_argument('-t', '--indentation', action='store', metavar='INDENT',
                                help='code indentation style, specify an integer for the number of spaces, '
-                                    "or 't'/'tab' for tabs (current: %s)" % __relaxedecor_indentation__)
+                                    "or 't'/'tab' for tabs (current: %s)" % relaxedecor_indentation)
     convert_group.add_argument('-n8', '--no-pep8', action='store_false', dest='pep8', default=None,
-                               help='do not make code insertion PEP 8 compliant (current: %s)' % __relaxedecor_pep8__)
+                               help='do not make code insertion PEP 8 compliant (current: %s)' % relaxedecor_pep8)
     convert_group.add_argument('-d', '--decorator-name', action='store', dest='decorator', metavar='NAME',
-                               default=__relaxedecor_decorator__, help='name of decorator for runtime checks (current: %s)' % __relaxedecor_decorator__)  # pylint: disable=line-too-long
+                               help='name of decorator for runtime checks (current: %s)' % relaxedecor_decorator)
+    convert_group.add_argument('--cache-dir', action='store', metavar='PATH',
+                               help='directory to cache conversion results (current: %s)' % relaxedecor_cache_dir)
 
     parser.add_argument('files', action='store', nargs='*', metavar='<Python source files and directories...>',
                         help='Python source files and directories to be converted')
@@ -966,14 +1220,70 @@ def get_parser() -> argparse.ArgumentParser:
     return parser
 
 
+@functools.lru_cache(maxsize=None)
+def _get_cached_parser() -> argparse.ArgumentParser:
+    """Get the CLI parser used by :func:`main`, which is only built once per process.
+
+    Returns:
+        argparse.ArgumentParser: CLI parser for relaxedecor
+
+    Note:
+        All option defaults are resolved by the option getters in :func:`main`
+        rather than by the parser, so reusing the parser is safe; only the
+        *current* values displayed in help messages reflect the environment
+        at the time the parser was first built.
+
+    """
+    return get_parser()
+
+
+def _file_may_have_decorators(filename: str) -> bool:
+    """Check if a file may be modified by the conversion.
+
+    Args:
+        filename (str): the file to check
+
+    Returns:
+        bool: if the file may contain decorators as checked by :func:`_may_have_decorators`;
+        files without them are never overwritten by :func:`relaxedecor`, thus need not be archived
+
+    The file is memory-mapped rather than read, so that it is scanned without
+    being copied into a :obj:`bytes` buffer.
+
+    """
+    with open(filename, 'rb') as file:
+        if os.fstat(file.fileno()).st_size == 0:  # empty files cannot be mapped
+            return False
+        with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            return _may_have_decorators(mapped)
+
+
+def _get_inode_order(filename: str) -> Tuple[int, int]:
+    """Get the sort key for converting files in inode order.
+
+    Args:
+        filename (str): the file to convert
+
+    Returns:
+        Tuple[int, int]: sort key of the file; files that cannot be stat-ed are sorted last,
+        so that their failures are reported by :func:`do_relaxedecor` as usual
+
+    """
+    try:
+        return (0, os.stat(filename).st_ino)
+    except OSError:
+        return (1, 0)
+
+
 def do_relaxedecor(filename: str, **kwargs: object) -> None:
     """Wrapper function to catch exceptions."""
     try:
         relaxedecor(filename, **kwargs)  # type: ignore[arg-type]
     except Exception:  # pylint: disable=broad-except
+        # format the report before taking the lock, so that it is held only for writing
+        message = 'Failed to convert file: %r\n%s' % (filename, traceback.format_exc())
         with TaskLock():
-            print('Failed to convert file: %r' % filename, file=sys.stderr)
-            traceback.print_exc()
+            sys.stderr.write(message)
 
 
 def main(argv: Optional[List[str]] = None) -> int:
@@ -992,18 +1302,21 @@ def main(argv: Optional[List[str]] = None) -> int:
      - :envvar:`RELAXEDECOR_INDENTATION` -- same as the ``--indentation`` option in CLI
      - :envvar:`RELAXEDECOR_PEP8` -- same as the ``--no-pep8`` option in CLI (logical negation)
      - :envvar:`RELAXEDECOR_DECORATOR` -- same as the ``--decorator-name`` option in CLI
+     - :envvar:`RELAXEDECOR_CACHE_DIR` -- same as the ``--cache-dir`` option in CLI
 
     """
-    parser = get_parser()
+    parser = _get_cached_parser()
     args = parser.parse_args(argv)
 
+    # resolve conversion options once in the main process, so that all workers use the same values
     options = {
-        'source_version': args.source_version,
-        'linesep': args.linesep,
-        'indentation': args.indentation,
-        'pep8': args.pep8,
-        'decorator': args.decorator,
-    }
+        'source_version': _get_source_version_option(args.source_version),
+        'linesep': _get_linesep_option(args.linesep),
+        'indentation': _get_indentation_option(args.indentation),
+        'pep8': _get_pep8_option(args.pep8),
+        'decorator': _get_decorator_option(args.decorator),
+        'cache_dir': _get_cache_dir_option(args.cache_dir),
+    }  # type: Dict[str, Any]
 
     # check if running in simple mode
     if args.simple_args is not None:
@@ -1053,7 +1366,19 @@ def main(argv: Optional[List[str]] = None) -> int:
 
     # make archive
     if do_archive and not args.dry_run:
-        archive_files(filelist, archive_path)
+        archive_list = [file for file in filelist if _file_may_have_decorators(file)]
+        if archive_list:  # no archive when no file will be overwritten
+            archive_files(archive_list, archive_path)
+
+    if not args.dry_run:
+        # load the grammar in the main process, so that forked workers inherit it from parso's cache;
+        # this is merely an optimisation, unsupported versions are reported per file by the workers
+        with contextlib.suppress(NotImplementedError, ValueError):
+            parso.load_grammar(version=options['source_version'])
+
+        # convert files in inode order, which approximates their on-disk order for read locality;
+        # the alphabetical order is kept for dry runs, as it is meant for reading
+        filelist.sort(key=_get_inode_order)
 
     # process files
     options.update({
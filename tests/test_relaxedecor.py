@@ -0,0 +1,279 @@
+# pylint: disable=protected-access
+import collections
+import json
+import os
+import tarfile
+import threading
+
+import pytest
+from bpc_utils import BPCSyntaxError
+from bpc_utils.typing import TYPE_CHECKING
+
+import relaxedecor
+from relaxedecor import convert, main
+
+from .testutils import read_text_file, write_text_file
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+    from bpc_utils.typing import List, Optional, Union
+
+    from .testutils import CaptureFixture, MonkeyPatch
+
+    # generic OrderedDict is not subscriptable at runtime before Python 3.7.2
+    StrOrderedDict = collections.OrderedDict[str, str]
+else:
+    StrOrderedDict = collections.OrderedDict
+
+#: Source code that requires conversion.
+RELAXED_CODE = '@buttons[0].clicked.connect\ndef spam():\n    return "é"\n'
+
+
+@pytest.fixture(autouse=True)
+def clean_environment(monkeypatch: 'MonkeyPatch') -> None:
+    """Clear relaxedecor environment variables and the in-process cache."""
+    for name in list(os.environ):
+        if name.startswith('RELAXEDECOR_'):
+            monkeypatch.delenv(name)
+    relaxedecor._memory_cache.clear()
+
+
+def list_cache_dir(cache_dir: 'Path') -> 'List[str]':
+    """List entries in a cache directory."""
+    return sorted(os.listdir(str(cache_dir))) if cache_dir.exists() else []
+
+
+def get_cache_key(code: 'Union[str, bytes]', pep8: 'Optional[bool]' = None) -> str:
+    """Compute the cache key of a conversion with default options."""
+    return relaxedecor._get_cache_key(code, source_version=None, linesep=None, indentation=None,
+                                      pep8=pep8, decorator='decorator')
+
+
+def test_cache_key_input_type() -> None:
+    key_str = get_cache_key('@a\n')
+    assert key_str != get_cache_key(b'@a\n')
+    assert key_str == get_cache_key('@a\n')
+    assert key_str != get_cache_key('@a\n', pep8=False)
+
+
+def test_cache_key_versions(monkeypatch: 'MonkeyPatch') -> None:
+    key = get_cache_key('@a\n')
+    with monkeypatch.context() as mpatch:
+        mpatch.setattr(relaxedecor.parso, '__version__', '0.0.0')
+        relaxedecor._get_cache_salt.cache_clear()
+        try:
+            assert key != get_cache_key('@a\n')
+        finally:
+            relaxedecor._get_cache_salt.cache_clear()
+    assert key == get_cache_key('@a\n')
+
+
+def test_cache_str_bytes_collision(tmp_path: 'Path') -> None:
+    coding = '# -*- coding: latin-1 -*-\n'
+    code_bytes = (coding + RELAXED_CODE).encode('utf-8')  # 'é' in UTF-8 reads as 'Ã©' in Latin-1
+    code_str = coding + RELAXED_CODE
+    cache_dir = str(tmp_path / 'cache')
+
+    assert 'return "Ã©"' in convert(code_bytes, cache_dir=cache_dir)
+    assert 'return "é"' in convert(code_str, cache_dir=cache_dir)
+
+    # neither the in-process nor the on-disk cache may mix them up
+    relaxedecor._memory_cache.clear()
+    assert 'return "Ã©"' in convert(code_bytes, cache_dir=cache_dir)
+    assert 'return "é"' in convert(code_str, cache_dir=cache_dir)
+
+
+def test_cache_round_trip(tmp_path: 'Path') -> None:
+    cache_dir = tmp_path / 'cache'
+    result = convert(RELAXED_CODE, cache_dir=str(cache_dir))
+    entries = list_cache_dir(cache_dir)
+    assert len(entries) == 1
+    assert read_text_file(str(cache_dir / entries[0])) == result
+
+    # a hit is served from disk without converting again
+    write_text_file(str(cache_dir / entries[0]), 'cached\n')
+    relaxedecor._memory_cache.clear()
+    assert convert(RELAXED_CODE, cache_dir=str(cache_dir)) == 'cached\n'
+
+    # a miss converts and adds a new entry
+    assert convert(RELAXED_CODE, cache_dir=str(cache_dir), pep8=False) != 'cached\n'
+    assert len(list_cache_dir(cache_dir)) == 2
+
+
+def test_cache_save_failure(tmp_path: 'Path', monkeypatch: 'MonkeyPatch') -> None:
+    def replace(src: str, dst: str) -> None:
+        raise OSError(28, 'No space left on device')
+
+    monkeypatch.setattr(relaxedecor.os, 'replace', replace)
+    relaxedecor._save_cache(str(tmp_path), 'key', 'result')
+    assert os.listdir(str(tmp_path)) == []
+
+
+@pytest.mark.parametrize('use_env', [False, True])
+def test_cache_dir_option(tmp_path: 'Path', monkeypatch: 'MonkeyPatch', use_env: bool) -> None:
+    cache_dir = tmp_path / 'cache'
+    src = tmp_path / 'src.py'
+    write_text_file(str(src), RELAXED_CODE)
+
+    argv = ['--simple', str(src)]
+    if use_env:
+        monkeypatch.setenv('RELAXEDECOR_CACHE_DIR', str(cache_dir))
+    else:
+        argv = ['--cache-dir', str(cache_dir)] + argv
+    assert main(argv) == 0
+    assert len(list_cache_dir(cache_dir)) == 1
+
+
+def test_memory_cache_str_bytes_collision() -> None:
+    coding = '# -*- coding: latin-1 -*-\n'
+    assert 'return "Ã©"' in convert((coding + RELAXED_CODE).encode('utf-8'))
+    assert 'return "é"' in convert(coding + RELAXED_CODE)
+
+
+def test_memory_cache_threads(monkeypatch: 'MonkeyPatch') -> None:
+    threads = []  # type: List[threading.Thread]
+
+    class InterleavingCache(StrOrderedDict):
+        """Cache that lets another thread update it between assignment and reordering."""
+
+        def move_to_end(self, key: str, last: bool = True) -> None:
+            if not threads:
+                thread = threading.Thread(target=relaxedecor._save_memory_cache, args=('other', 'result'))
+                threads.append(thread)
+                thread.start()
+                thread.join(timeout=0.1)  # blocks on the lock, unless there is none
+            super().move_to_end(key, last)
+
+    monkeypatch.setattr(relaxedecor, '_MEMORY_CACHE_SIZE', 1)
+    monkeypatch.setattr(relaxedecor, '_memory_cache', InterleavingCache())
+    relaxedecor._save_memory_cache('key', 'result')
+    threads[0].join()
+    assert list(relaxedecor._memory_cache) == ['other']
+
+
+def test_unsupported_source_version(tmp_path: 'Path', monkeypatch: 'MonkeyPatch',
+                                    capsys: 'CaptureFixture[str]') -> None:
+    src = tmp_path / 'src.py'
+    write_text_file(str(src), RELAXED_CODE)
+    monkeypatch.setenv('RELAXEDECOR_SOURCE_VERSION', '2.7')
+    assert main(['--quiet', '--no-archive', '--concurrency', '1', str(src)]) == 0
+    assert 'Failed to convert file: %r' % str(src) in capsys.readouterr().err
+    assert read_text_file(str(src)) == RELAXED_CODE
+
+
+def test_vanished_file(tmp_path: 'Path', monkeypatch: 'MonkeyPatch', capsys: 'CaptureFixture[str]') -> None:
+    present = tmp_path / 'present.py'
+    vanished = tmp_path / 'vanished.py'
+    write_text_file(str(present), RELAXED_CODE)
+    write_text_file(str(vanished), RELAXED_CODE)
+
+    # the file disappears after being detected
+    detect_files = relaxedecor.detect_files
+
+    def detect_and_remove(files: 'List[str]') -> 'List[str]':
+        filelist = list(detect_files(files))
+        vanished.unlink()
+        return filelist
+
+    monkeypatch.setattr(relaxedecor, 'detect_files', detect_and_remove)
+    assert main(['--quiet', '--no-archive', '--concurrency', '1', str(tmp_path)]) == 0
+    assert 'Failed to convert file: %r' % str(vanished) in capsys.readouterr().err
+    assert read_text_file(str(present)) != RELAXED_CODE
+
+
+def test_archive_filter(tmp_path: 'Path') -> None:
+    src_dir = tmp_path / 'src'
+    archive_dir = tmp_path / 'archive'
+    src_dir.mkdir()
+    plain = 'def spam():\n    return "spam"\n'
+    write_text_file(str(src_dir / 'plain.py'), plain)
+    write_text_file(str(src_dir / 'empty.py'), '')
+
+    # no archive is made when no file will be overwritten
+    argv = ['--quiet', '--concurrency', '1', '--archive-path', str(archive_dir), str(src_dir)]
+    assert main(argv) == 0
+    assert list_cache_dir(archive_dir) == []
+    assert read_text_file(str(src_dir / 'plain.py')) == plain
+
+    # only files that may contain decorators are archived
+    write_text_file(str(src_dir / 'relaxed.py'), RELAXED_CODE)
+    assert main(argv) == 0
+    archives = list_cache_dir(archive_dir)
+    assert len(archives) == 1
+    with tarfile.open(str(archive_dir / archives[0])) as archive:
+        lookup_table = json.load(archive.extractfile('_lookup_table.json'))  # type: ignore[arg-type]
+    assert sorted(map(os.path.basename, lookup_table.values())) == ['relaxed.py']
+    assert read_text_file(str(src_dir / 'plain.py')) == plain
+    assert read_text_file(str(src_dir / 'relaxed.py')) != RELAXED_CODE
+
+
+#: Source code with relaxed decorators in places the pre-parse check must not miss.
+PREFILTER_CODE = {
+    'cr': 'import os\r@buttons[0].clicked.connect\rdef spam():\r    pass\r',
+    'crlf': 'import os\r\n@buttons[0].clicked.connect\r\ndef spam():\r\n    pass\r\n',
+    'bom': '\ufeff@buttons[0].clicked.connect\ndef spam():\n    pass\n',
+    'tab': 'class Spam:\n\t@buttons[0].clicked.connect\n\tdef spam(self):\n\t\tpass\n',
+    'string': 'doc = """\n@ham\n"""\n@buttons[0].clicked.connect\ndef spam():\n    return """\n@eggs\n"""\n',
+}
+
+
+@pytest.mark.parametrize('as_bytes', [False, True], ids=['str', 'bytes'])
+@pytest.mark.parametrize('name', sorted(PREFILTER_CODE))
+def test_prefilter(name: str, as_bytes: bool, monkeypatch: 'MonkeyPatch') -> None:
+    code = PREFILTER_CODE[name]  # type: Union[str, bytes]
+    if as_bytes:
+        code = PREFILTER_CODE[name].encode('utf-8')
+    assert relaxedecor._may_have_decorators(code)
+
+    result = convert(code)
+    assert '@_relaxedecor_decorator(buttons[0].clicked.connect)' in result
+    if name == 'string':
+        assert '\n@ham\n' in result and '\n@eggs\n' in result
+
+    # same result as without the pre-parse check
+    relaxedecor._memory_cache.clear()
+    monkeypatch.setattr(relaxedecor, '_may_have_decorators', lambda code: True)
+    assert convert(code) == result
+
+
+@pytest.mark.parametrize('as_bytes', [False, True], ids=['str', 'bytes'])
+def test_prefilter_form_feed(as_bytes: bool) -> None:
+    code = 'class Spam:\n\f    @buttons[0].clicked.connect\n    def spam(self):\n        pass\n'
+    source = code.encode('utf-8') if as_bytes else code  # type: Union[str, bytes]
+    assert relaxedecor._may_have_decorators(source)
+
+    # parso does not support form feeds in indentation, which must be reported rather than skipped
+    with pytest.raises(BPCSyntaxError):
+        convert(source)
+
+
+@pytest.mark.parametrize('as_bytes', [False, True], ids=['str', 'bytes'])
+@pytest.mark.parametrize('code,may_have_decorators', [
+    ('a = b @ c\nb @= c\n', False),
+    ('a = (b\n     @ c)\n', True),  # false positive, parsed but unchanged
+])
+def test_prefilter_matmul(code: str, may_have_decorators: bool, as_bytes: bool) -> None:
+    source = code.encode('utf-8') if as_bytes else code  # type: Union[str, bytes]
+    assert relaxedecor._may_have_decorators(source) is may_have_decorators
+    assert convert(source) == code
+
+
+@pytest.mark.parametrize('linesep', ['\r\n', '\r'], ids=['crlf', 'cr'])
+def test_relaxedecor_linesep(tmp_path: 'Path', linesep: str) -> None:
+    src = tmp_path / 'src.py'
+    src.write_bytes(RELAXED_CODE.replace('\n', linesep).encode('utf-8'))
+    relaxedecor.relaxedecor(str(src), quiet=True)
+
+    result = src.read_bytes()
+    assert b'_relaxedecor_decorator' in result
+    assert result.replace(b'\r\n', b'').count(b'\n') == 0  # no bare LF inserted
+    assert result.count(linesep.encode()) > RELAXED_CODE.count('\n')
+
+
+def test_unchanged_file_not_rewritten(tmp_path: 'Path') -> None:
+    src = tmp_path / 'src.py'
+    write_text_file(str(src), '@property\ndef spam(self):\n    pass\n')  # parsed but not converted
+    os.utime(str(src), (0, 0))
+    assert main(['--quiet', '--no-archive', '--concurrency', '1', str(src)]) == 0
+    assert src.stat().st_mtime == 0